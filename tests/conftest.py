@@ -0,0 +1,26 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app-simple.py"
+
+
+def _load_app():
+    """Execute the app script as a fresh module, as a Streamlit rerun does"""
+    spec = importlib.util.spec_from_file_location("app_simple", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def load_app():
+    return _load_app
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return _load_app().ComprehensiveMedicalKnowledgeBase()
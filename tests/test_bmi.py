@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def app(load_app):
+    return load_app()
+
+
+def test_category_boundary_is_exact(app):
+    # 49 kg at 140 cm is exactly 25.0, the first overweight value
+    assert app.calculate_bmi(49, 140) == 25.0
+    assert app.bmi_category(app.calculate_bmi(49, 140)) == "Overweight"
+
+
+def test_table_matches_direct_formula(app):
+    for height_cm in range(app.BMI_MIN_HEIGHT_CM, app.BMI_MAX_HEIGHT_CM + 1):
+        for weight_kg in (20, 49, 70, 300):
+            assert app.bmi_category(app.calculate_bmi(weight_kg, height_cm)) == \
+                app.bmi_category(weight_kg * 10000 / height_cm ** 2)
+
+
+def test_category_follows_displayed_value(app):
+    assert app.bmi_category(24.96) == "Overweight"
+    assert app.bmi_category(18.44) == "Underweight"
+    assert app.bmi_category(18.46) == "Normal weight"
+    assert app.bmi_category(29.94) == "Overweight"
+    assert app.bmi_category(30.0) == "Obese"
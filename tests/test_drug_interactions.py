@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.mark.parametrize("drug1, drug2, effect", [
+    ("warfarin", "NSAID", "Increased bleeding risk"),
+    ("Warfarin", "NSAIDs", "Increased bleeding risk"),
+    ("warfarin", "antibiotic", "Increased INR"),
+    ("Warfarin", "Antibiotic", "Increased INR"),
+    ("warfarin", "antifungal", "Increased anticoagulation"),
+    ("Warfarin", "Ibuprofen", "Increased bleeding risk"),
+    ("warfarin sodium", "acetylsalicylic acid", "Increased bleeding risk"),
+])
+def test_class_and_alias_pairs_report_major_interaction(kb, drug1, drug2, effect):
+    interaction = kb.find_interaction(drug1, drug2)
+    assert interaction is not None
+    assert interaction["severity"] == "Major"
+    assert interaction["effect"] == effect
+
+
+def test_specific_pair_takes_precedence_over_class(kb):
+    # Aspirin and ibuprofen are both NSAIDs, but their own entry is the one to show
+    interaction = kb.find_interaction("Ibuprofen", "Aspirin")
+    assert interaction["effect"] == "Reduced cardioprotective effect"
+
+
+def test_unrelated_drugs_have_no_interaction(kb):
+    assert kb.find_interaction("Lisinopril", "Metformin") is None
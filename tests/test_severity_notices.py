@@ -0,0 +1,13 @@
+def test_cached_records_keep_severity_notices_across_reruns(load_app):
+    # The knowledge base is cached, so later runs render records built by the first run
+    first_run = load_app()
+    kb = first_run.ComprehensiveMedicalKnowledgeBase()
+    rerun = load_app()
+    assert rerun.SeverityLevel is not first_run.SeverityLevel
+
+    critical = kb.conditions["myocardial_infarction"]
+    assert critical.severity.name == "CRITICAL"
+    assert "critical condition requiring immediate medical attention" in rerun.safe_format_condition_html(critical)
+
+    high = next(c for c in kb.conditions.values() if c.severity.name == "HIGH")
+    assert "requires prompt medical attention" in rerun.safe_format_condition_html(high)